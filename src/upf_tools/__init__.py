@@ -2,4 +2,23 @@
 
 """Tools for handling .upf (Unified UPFDict Format) files."""
 
-from .upfdict import UPFDict  # noqa: F401
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .upfdict import UPFDict
+
+__all__ = ["UPFDict"]
+
+
+def __getattr__(name):
+    """Import :class:`UPFDict` on first access, keeping ``import upf_tools`` (and the CLI) lightweight."""
+    if name == "UPFDict":
+        from .upfdict import UPFDict
+
+        return UPFDict
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    """List the public names of the package, including those that are imported lazily."""
+    return sorted(set(globals()) | set(__all__))
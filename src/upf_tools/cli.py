@@ -17,8 +17,6 @@ import logging
 
 import click
 
-from upf_tools import UPFDict
-
 __all__ = [
     "main",
 ]
@@ -41,6 +39,8 @@ def to_input(filename):
     :param filename: the name of the .upf file
     :type filename: str
     """
+    from upf_tools import UPFDict
+
     psp = UPFDict.from_upf(filename)
     inp = psp.to_input()
     click.echo(inp)
@@ -54,6 +54,8 @@ def to_dat(filename):
     :param filename: the name of the .upf file
     :type filename: str
     """
+    from upf_tools import UPFDict
+
     psp = UPFDict.from_upf(filename)
     dat = psp.to_dat()
     click.echo(dat)
@@ -1,11 +1,11 @@
 """Module that supports the projector file format for ``pw2wannier90`` and ``Wannier90``."""
 
+import io
 from collections import UserList
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Generic, TypeVar
 
-import matplotlib.pyplot as plt
 import numpy as np
 
 ProjType = TypeVar("ProjType", bound="Projector")
@@ -28,13 +28,16 @@ class Projector:
 
     @x.setter
     def x(self, value):
+        # Clamp the grid without modifying the array that was passed in, which may be shared with other projectors
+        value = np.asarray(value)
+        if np.any(value < self._x_min):
+            value = np.maximum(value, self._x_min)
         self._x = value
-        self._x[self._x < self._x_min] = self._x_min
 
     @property
     def r(self):
         """The radial grid."""
-        return np.exp(self.x)
+        return np.exp(self._x)
 
     @r.setter
     def r(self, value):
@@ -42,6 +45,8 @@ class Projector:
 
     def plot(self, ax=None, **kwargs):
         """Plot the projector."""
+        import matplotlib.pyplot as plt
+
         if ax is None:
             _, ax = plt.subplots()
         if "label" not in kwargs:
@@ -57,15 +62,16 @@ class Projectors(UserList, Generic[ProjType]):
 
     def to_str(self) -> str:
         """Convert the Projectors into a string following the format for ``pw2wannier90`` and ``Wannier90``."""
-        lines = [
-            f"{len(self.data[0].x)} {len(self.data)}",
-            " ".join([str(proj.l) for proj in self.data]),
-        ]
-        content = np.concatenate(
-            [np.vstack([self.data[0].x, self.data[0].r]), [p.y for p in self.data]]
-        ).transpose()
-        lines += [" ".join([f"{v:18.12e}" for v in row]) for row in content]
-        return "\n".join(lines)
+        header = "\n".join(
+            [
+                f"{len(self.data[0].x)} {len(self.data)}",
+                " ".join([str(proj.l) for proj in self.data]),
+            ]
+        )
+        content = np.column_stack([self.data[0].x, self.data[0].r] + [p.y for p in self.data])
+        buffer = io.StringIO()
+        np.savetxt(buffer, content, fmt="%18.12e", header=header, comments="")
+        return buffer.getvalue().rstrip("\n")
 
     def to_file(self, filename: Path):
         """Dump the Projectors to a file following the format for ``pw2wannier90`` and ``Wannier90``."""
@@ -75,8 +81,9 @@ class Projectors(UserList, Generic[ProjType]):
     @classmethod
     def from_str(cls, string: str) -> "Projectors":
         """Create a Projectors object from a string that follows the format for ``pw2wannier90`` and ``Wannier90``."""
-        lines = [l for l in string.split("\n") if l]
-        content = np.array([[float(v) for v in row.split()] for row in lines[2:]]).transpose()
+        lines = [l for l in string.splitlines() if l]
+        # np.loadtxt rejects ragged rows; the transpose is a view, so the table is not copied again
+        content = np.loadtxt(lines[2:], ndmin=2).transpose()
         lvals = [int(l) for l in lines[1].split()]
         data = [Projector(content[0], y, l) for l, y in zip(lvals, content[2:])]
 
@@ -2,20 +2,24 @@
 
 from __future__ import annotations
 
-from collections import OrderedDict
+import copy
+import io
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Optional, Union
+from typing import TYPE_CHECKING, Any, Optional, Union
 
 import numpy as np
-from oncvpsp_tools import ONCVPSPInput
 from packaging.version import Version
 
 from .utils import get_version_number
 from .v1 import upfv1contents_to_dict
 from .v2 import upfv2contents_to_dict
 
+if TYPE_CHECKING:
+    from oncvpsp_tools import ONCVPSPInput
 
-class UPFDict(OrderedDict):
+
+class UPFDict(dict):
     """Class that contains all of the information of a UPF pseudopotential file.
 
     Note that it will usually be more convenient to create a :class:`UPFDict` object using
@@ -88,8 +92,16 @@ class UPFDict(OrderedDict):
         self._version = value
 
     @classmethod
-    def from_str(cls, string: str) -> UPFDict:
-        """Create a :class:`UPFDict` object from a string (typically the contents of a ``.upf`` file)."""
+    def from_str(cls, string: Union[str, bytes]) -> UPFDict:
+        """Create a :class:`UPFDict` object from a string (typically the contents of a ``.upf`` file).
+
+        The contents may also be provided as undecoded ``bytes``, in which case UPF v2 files are handed to the xml
+        parser as they are.
+
+        :param string: the contents of a ``.upf`` file, either as text or as raw bytes
+
+        :returns: the corresponding :class:`UPFDict` object
+        """
         # Fetch the version number
         version = get_version_number(string)
 
@@ -97,7 +109,7 @@ class UPFDict(OrderedDict):
         if version >= Version("2.0.0"):
             dct = upfv2contents_to_dict(string)
         else:
-            dct = upfv1contents_to_dict(string)
+            dct = upfv1contents_to_dict(string if isinstance(string, str) else string.decode())
 
         return cls(version, **dct)
 
@@ -107,12 +119,10 @@ class UPFDict(OrderedDict):
         # Sanitise input
         filename = filename if isinstance(filename, Path) else Path(filename)
 
-        # Read the file contents
-        with open(filename, "r") as fd:
-            flines = fd.read()
-
-        # Use cls.from_str to construct the pseudopotential information
-        psp = cls.from_str(flines)
+        # Parse the file, reusing the result of an earlier call if the file has not changed since. The cached
+        # object is copied so that modifying the returned UPFDict can never affect later calls
+        stat = filename.stat()
+        psp = copy.deepcopy(_parse_upf(cls, filename.resolve(), stat.st_mtime_ns, stat.st_size))
         psp.filename = filename
 
         return psp
@@ -127,27 +137,24 @@ class UPFDict(OrderedDict):
 
         :returns: the contents of a ``.dat`` file
         """
-        # Fetch the r-mesh
-        rmesh = self["mesh"]["r"]
+        # Fetch the r-mesh, avoiding r = 0
+        min_r = 1e-8
+        rmesh = np.maximum(self["mesh"]["r"], min_r)
 
         # Construct a logarithmic mesh
-        min_r = 1e-8
-        rmesh = [max(r, min_r) for r in rmesh]
         xmesh = np.log(rmesh)
 
         # Extract the pseudo wavefunctions, sorted by l and n
         if "chi" not in self["pswfc"]:
             raise ValueError("This pseudopotential does not contain any pseudo-wavefunctions")
         chis = sorted(self["pswfc"]["chi"], key=lambda chi: (chi["l"], chi["n"]))
-        data = np.transpose([chi["content"] for chi in chis])
-
-        dat = [f"{len(rmesh)} {len(chis)}", " ".join([str(chi["l"]) for chi in chis])]
-        dat += [
-            f"{x:20.15f} {r:20.15f} " + " ".join([f"{v:25.15e}" for v in row])
-            for x, r, row in zip(xmesh, rmesh, data)
-        ]
 
-        return "\n".join(dat)
+        header = "\n".join([f"{len(rmesh)} {len(chis)}", " ".join([str(chi["l"]) for chi in chis])])
+        content = np.column_stack([xmesh, rmesh] + [chi["content"] for chi in chis])
+        fmt = "%20.15f %20.15f " + " ".join(["%25.15e"] * len(chis))
+        buffer = io.StringIO()
+        np.savetxt(buffer, content, fmt=fmt, header=header, comments="")
+        return buffer.getvalue().rstrip("\n")
 
     def to_input(self) -> str:
         """Extract the contents of the input file block."""
@@ -159,6 +166,8 @@ class UPFDict(OrderedDict):
 
     def to_oncvpsp_input(self) -> ONCVPSPInput:
         """Extract the oncvpsp.x input file used to generate the pseudopotential."""
+        from oncvpsp_tools import ONCVPSPInput
+
         input_str = self.to_input()
         if "&input" in input_str.lower():
             raise ValueError("This pseudopotential was generated with ld1.x, not oncvpsp.x")
@@ -170,3 +179,29 @@ class UPFDict(OrderedDict):
         if "&input" not in input_str.lower():
             raise ValueError("This pseudopotential does not appear to have been generated by ld1.x")
         return input_str
+
+
+@lru_cache(maxsize=32)
+def _parse_upf(cls, filename: Path, mtime_ns: int, size: int) -> UPFDict:
+    """Read and parse a ``.upf`` file, caching the result.
+
+    The cache only holds the 32 most recently parsed files, to bound its memory use. It speeds up reloading a small
+    working set of files, but a sweep over more than 32 files in a fixed order evicts every entry before it is
+    reused, so each call then pays for both the parse and the copy.
+
+    :param cls: the class whose ``from_str`` method constructs the pseudopotential
+    :param filename: the resolved path to the ``.upf`` file
+    :param mtime_ns: the modification time of the file in nanoseconds, only used to invalidate the cache
+    :param size: the size of the file in bytes, only used to invalidate the cache
+
+    :returns: the corresponding pseudopotential object, which callers must not modify
+    """
+    # Read the file contents (without decoding them, which is left to cls.from_str)
+    with open(filename, "rb") as fd:
+        flines = fd.read()
+
+    # Use cls.from_str to construct the pseudopotential information
+    psp = cls.from_str(flines)
+    psp.filename = filename
+
+    return psp
@@ -3,24 +3,42 @@
 import json
 import re
 import warnings
-from typing import Any
+from functools import lru_cache
+from typing import Any, Union
 
 from packaging.version import Version
 
 REGEX_UPF_VERSION = re.compile(
     r"""
-    \s*<UPF\s+version\s*="
+    <UPF\s+version\s*="
     (?P<version>.*)">
     """,
     re.VERBOSE,
 )
+REGEX_UPF_VERSION_BYTES = re.compile(REGEX_UPF_VERSION.pattern.encode(), re.VERBOSE)
 
+REGEX_JSON_NUMBER = re.compile(
+    r"""
+    [ \t\n\r]*
+    -?(?:0|[1-9]\d*)
+    (?P<fraction>(?:\.\d+)?(?:[eE][-+]?\d+)?)
+    [ \t\n\r]*
+    """,
+    re.VERBOSE | re.ASCII,
+)
 
-def get_version_number(string: str) -> Version:
-    """Extract the version number from the contents of a UPF file."""
-    match = REGEX_UPF_VERSION.search(string)
+# The characters that a json value (including Python's NaN and Infinity extensions) can start with
+JSON_FIRST_CHARACTERS = frozenset('-0123456789"[{tfnNI')
+
+
+def get_version_number(string: Union[str, bytes]) -> Version:
+    """Extract the version number from the contents of a UPF file, given either as text or as raw bytes."""
+    regex = REGEX_UPF_VERSION if isinstance(string, str) else REGEX_UPF_VERSION_BYTES
+    # The version is given by the opening <UPF> tag, so look at the start of the file before the rest of it
+    match = regex.search(string, 0, 1024) or regex.search(string)  # type: ignore[arg-type]
     if match:
-        return Version(match.group("version"))
+        version = match.group("version")
+        return Version(version if isinstance(version, str) else version.decode())
     else:
         warnings.warn(f"Could not determine the UPF version. Assuming v1.0.0")  # noqa
         return Version("1.0.0")
@@ -28,8 +46,36 @@ def get_version_number(string: str) -> Version:
 
 def sanitise(value: str) -> Any:
     """Convert an arbitrary string to an int/float/bool if it appears to be one of these."""
+    # Arrays and objects are mutable, so they are parsed afresh rather than shared via the cache
+    if value.lstrip(" \t\n\r").startswith(("[", "{")):
+        return _json_loads_or_str(value)
+    return _sanitise_scalar(value)
+
+
+# UPF files repeat the same attribute values (small ints, labels, flags) many times over. Only immutable
+# results are cached, as the cached objects are shared between calls
+@lru_cache(maxsize=4096)
+def _sanitise_scalar(value: str) -> Any:
+    """Convert a string that is not a json array or object, as :func:`sanitise` would."""
+    # Most values are plain numbers, which can be converted directly without going through json
+    match = REGEX_JSON_NUMBER.fullmatch(value)
+    if match:
+        return float(value) if match.group("fraction") else int(value)
+    # Labels such as "Si" or "PBE" cannot be json, so skip the cost of json.loads raising an error
+    if value.lstrip(" \t\n\r")[:1] not in JSON_FIRST_CHARACTERS:
+        return value
+    return _json_loads_or_str(value)
+
+
+def _json_loads_or_str(value: str) -> Any:
+    """Parse a string as json, returning it unchanged if it is not valid json."""
     try:
-        value = json.loads(value)
+        return json.loads(value)
     except json.decoder.JSONDecodeError:
-        pass
-    return value
+        return value
+
+
+@lru_cache(maxsize=256)
+def normalise_tag(tag: str) -> str:
+    """Convert a UPF tag into the corresponding dictionary key e.g. ``PP_CHI.1`` becomes ``chi``."""
+    return tag.split(".")[0].replace("PP_", "").lower()
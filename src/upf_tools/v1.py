@@ -1,43 +1,91 @@
 """Functions for parsing UPF v1 files."""
 
-from typing import Any, Dict, List
+import re
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 from numpy.typing import NDArray
 
+from upf_tools.utils import normalise_tag
 
-def extract_block(tag, lines: List[str]) -> List[str]:
-    """Extract an block starting <tag> and ending </tag> from lines of text."""
-    istart = next((i for i, line in enumerate(lines) if f"<{tag}" in line), None)
+REGEX_TAG = re.compile(r"\s*<(?P<tag>\w+)")
+
+
+def find_tag_lines(lines: List[str]) -> List[int]:
+    """Find the indices of all the lines in ``lines`` that open a tag."""
+    return [i for i, line in enumerate(lines) if REGEX_TAG.match(line)]
+
+
+def find_next_tag(lines: List[str], start: int, end: int, tag_lines: List[int]) -> Tuple[int, str]:
+    """Find the first line in ``lines[start:end]`` that opens a tag.
+
+    :param lines: the lines of the file
+    :param start: the index of the first line to search
+    :param end: the index after the last line to search
+    :param tag_lines: the (sorted) indices of all lines that open a tag, as returned by :func:`find_tag_lines`
+
+    :returns: the index of that line (``end`` if there is none) and the name of the tag
+    """
+    position = bisect_left(tag_lines, start)
+    if position < len(tag_lines) and tag_lines[position] < end:
+        i = tag_lines[position]
+        return i, REGEX_TAG.match(lines[i]).group("tag")  # type: ignore[union-attr]
+    return end, ""
+
+
+def extract_block(
+    tag, lines: List[str], start: int = 0, end: Optional[int] = None
+) -> Tuple[int, int]:
+    """Locate a block starting <tag> and ending </tag> within ``lines[start:end]``.
+
+    :param tag: the name of the tag
+    :param lines: the lines of the file
+    :param start: the index of the first line to search
+    :param end: the index after the last line to search (defaults to the end of ``lines``)
+
+    :raises ValueError: the opening or closing tag could not be found
+
+    :returns: the indices of the first and last lines of the block
+    """
+    end = len(lines) if end is None else end
+    opening, closing = f"<{tag}", f"</{tag}"
+
+    # Look for the opening and closing lines in a single pass
+    istart = None
+    for i in range(start, end):
+        if istart is None and opening in lines[i]:
+            istart = i
+        if istart is not None and closing in lines[i]:
+            return istart, i
 
     if istart is None:
         raise ValueError(f"<{tag}> not found")
+    raise ValueError(f"</{tag}> not found")
 
-    ilength = next((i for i, line in enumerate(lines[istart:]) if f"</{tag}" in line), None)
-
-    if ilength is None:
-        raise ValueError(f"</{tag}> not found")
 
-    return lines[istart : istart + ilength + 1]
+def lines_to_array(lines: List[str]) -> NDArray[np.float64]:
+    """Convert lines of whitespace-separated numbers into a flat array, raising a ValueError for any invalid number."""
+    return np.array(" ".join(lines).split(), dtype=float)
 
 
 def sanitise_pswfc(dct: Dict[str, Any]) -> Dict[str, Any]:
     """Sanitise a PSWFC entry that has been read in with the default reader."""
     lines = dct["content"]
+    # Each wavefunction starts with a header line, followed by its values
+    headers = [i for i, line in enumerate(lines) if "Wavefunction" in line]
     dct = {"chi": []}
-    array: List[str] = []
-    for line in lines:
-        if "Wavefunction" in line:
-            if array:
-                dct["chi"][-1]["content"] = np.array(array, dtype=float)
-            label, l, occupation, _ = line.split()
-            dct["chi"].append(
-                {"label": label, "n": int(label[0]), "l": l, "occupation": float(occupation)}
-            )
-            array = []
-        else:
-            array += line.split()
-    dct["chi"][-1]["content"] = np.array(array, dtype=float)
+    for start, end in zip(headers, headers[1:] + [len(lines)]):
+        label, l, occupation, _ = lines[start].split()
+        dct["chi"].append(
+            {
+                "label": label,
+                "n": int(label[0]),
+                "l": l,
+                "occupation": float(occupation),
+                "content": lines_to_array(lines[start + 1 : end]),
+            }
+        )
     return dct
 
 
@@ -47,7 +95,7 @@ def sanitise_beta(dct: Dict[str, Any]) -> Dict[str, Any]:
     index, l, beta, _ = lines[0].split()
     assert beta == "Beta"
     ncols = len(lines[2].split())
-    array = np.array([v for row in lines[2:] for v in row.split()], dtype=float)
+    array = lines_to_array(lines[2:])
     dct = {
         "type": "real",
         "size": len(array),
@@ -82,70 +130,79 @@ def sanitise_header(dct: Dict[str, Any]) -> Dict[str, Any]:
 
 def sanitise_numeric_array(dct: Dict[str, Any]) -> NDArray[np.float64]:
     """Sanitise a dict that only contains a numeric array."""
-    array = np.array([v for row in dct["content"] for v in row.split()], dtype=float)
+    array = lines_to_array(dct["content"])
     return array
 
 
 def sanitise_dij(dct: Dict[str, Any]) -> Dict[str, Any]:
     """Sanitise a DIJ entry that has been read in with the default reader."""
     lines = dct["content"]
-    length = max([int(line.split()[1]) for line in lines[1:]])
+    triplets = np.loadtxt(lines[1:], ndmin=2)
+    rows = triplets[:, 0].astype(int) - 1
+    columns = triplets[:, 1].astype(int) - 1
+    length = int(columns.max()) + 1
     content = np.zeros((length, length))
-    for row in lines[1:]:
-        i, j, val = row.split()
-        content[int(i) - 1, int(j) - 1] = float(val)
+    content[rows, columns] = triplets[:, 2]
     dct = {"type": "real", "size": length**2, "content": content}
     return dct
 
 
-def block_to_dict(lines: List[str]) -> Dict[str, Any]:
-    """Convert a block of lines from a UPF v1 file into a nested dictionary."""
+# The sanitisers for particular blocks, keyed by their normalised tag
+SANITISERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "pswfc": sanitise_pswfc,
+    "header": sanitise_header,
+    "r": sanitise_numeric_array,
+    "rab": sanitise_numeric_array,
+    "nlcc": sanitise_numeric_array,
+    "local": sanitise_numeric_array,
+    "beta": sanitise_beta,
+    "dij": sanitise_dij,
+    "rhoatom": sanitise_numeric_array,
+}
+
+
+def block_to_dict(
+    lines: List[str],
+    start: int = 0,
+    end: Optional[int] = None,
+    tag_lines: Optional[List[int]] = None,
+) -> Dict[str, Any]:
+    """Convert the block ``lines[start:end]`` of a UPF v1 file into a nested dictionary.
+
+    Children are parsed by passing index bounds rather than by slicing or deleting from ``lines``,
+    so that each line is only visited a handful of times regardless of the number of blocks.
+
+    :param lines: the lines of the file
+    :param start: the index of the first line of the block
+    :param end: the index after the last line of the block (defaults to the end of ``lines``)
+    :param tag_lines: the indices of all lines that open a tag; computed from ``lines`` if not provided
+
+    :returns: a (possibly nested) dict
+    """
+    end = len(lines) if end is None else end
+    tag_lines = find_tag_lines(lines) if tag_lines is None else tag_lines
     dct: Dict[str, Any] = {}
 
     # Parse the text
-    inext = next((i for i, line in enumerate(lines) if line.strip().startswith("<")), None)
-    textlines = lines if inext is None else lines[:inext]
-    text = [line for line in textlines if line.strip()]
+    inext, tag = find_next_tag(lines, start, end, tag_lines)
+    text = [line for line in lines[start:inext] if line.strip()]
     if len(text) > 0:
         dct["content"] = text
 
     # Loop over children
-    while True:
-        # Find the next child
-        inext, match = next(
-            ((i, line) for i, line in enumerate(lines) if line.strip().startswith("<")),
-            (None, None),
-        )
-        if inext is None:
-            # If there are no more tags, we are finished
-            break
-        assert match is not None
-        tag = match.strip()[1:-1].split()[0]
-
-        # Extract and parse that block
-        block = extract_block(tag, lines)
-
-        # Remove everything up to the end of the new block
-        del lines[: inext + len(block)]
+    while inext < end:
+        # Locate that block
+        istart, iend = extract_block(tag, lines, inext, end)
 
         # Parse the contents of the block with a generic parser
-        subdct = block_to_dict(block[1:-1])
-        tag = tag.replace("PP_", "").lower()
+        subdct = block_to_dict(lines, istart + 1, iend, tag_lines)
+        # The normalised tags are cached, so the many dicts sharing a key (e.g. one per beta) share one string
+        tag = normalise_tag(tag)
 
         # Sanitise particular blocks
-        sanitisers = {
-            "pswfc": sanitise_pswfc,
-            "header": sanitise_header,
-            "r": sanitise_numeric_array,
-            "rab": sanitise_numeric_array,
-            "nlcc": sanitise_numeric_array,
-            "local": sanitise_numeric_array,
-            "beta": sanitise_beta,
-            "dij": sanitise_dij,
-            "rhoatom": sanitise_numeric_array,
-        }
-        if tag in sanitisers:
-            subdct = sanitisers[tag](subdct)
+        sanitiser = SANITISERS.get(tag)
+        if sanitiser is not None:
+            subdct = sanitiser(subdct)
 
         # Store the dict
         if tag in dct:
@@ -154,10 +211,13 @@ def block_to_dict(lines: List[str]) -> Dict[str, Any]:
             dct[tag].append(subdct)
         else:
             dct[tag] = subdct
+
+        # Find the next child, starting after the end of this block
+        inext, tag = find_next_tag(lines, iend + 1, end, tag_lines)
     return dct
 
 
 def upfv1contents_to_dict(string: str) -> Dict[str, Any]:
     """Convert the contents of a UPF v1 file into a nested dictionary."""
-    lines = string.split("\n")
+    lines = string.splitlines()
     return block_to_dict(lines)
@@ -1,12 +1,84 @@
 """Various helpful xml-related functions for upf-tools."""
 
-from typing import Any, Dict
+from typing import Any, Dict, Union
 from xml.etree import ElementTree  # noqa
 
 import numpy as np
+from defusedxml import EntitiesForbidden
 from defusedxml.ElementTree import fromstring as defused_fromstring
 
-from upf_tools.utils import sanitise
+from upf_tools.utils import normalise_tag, sanitise
+
+try:
+    # Entity resolution and network access are disabled in LXML_PARSER_OPTIONS, and check_entities runs afterwards
+    from lxml import etree as lxml_etree  # noqa: S410
+except ImportError:  # lxml is an optional dependency; fall back to defusedxml
+    lxml_etree = None
+
+LXML_PARSER_OPTIONS = dict(
+    resolve_entities=False,
+    no_network=True,
+    remove_comments=True,
+    remove_pis=True,
+    collect_ids=False,
+)
+
+# Attributes that describe the layout of numeric data, which is redundant once it has been read into an array
+SKIPPED_ATTRIBUTES = frozenset(["type", "columns", "size"])
+
+
+def parse_xml(string: Union[str, bytes]) -> ElementTree.Element:
+    """Parse an xml string, using the (much faster) :mod:`lxml` if it is installed and :mod:`defusedxml` if not.
+
+    The :mod:`lxml` parser is configured to neither resolve entities nor access the network, and to drop comments
+    and processing instructions so that the resulting tree matches the one produced by :mod:`defusedxml`. UPF files
+    do not use xml IDs, so the parser does not build a table of them either. Entities are rejected with the same
+    errors that :mod:`defusedxml` raises (see :func:`check_entities`), and syntax errors are reraised as the
+    :class:`~xml.etree.ElementTree.ParseError` that :mod:`defusedxml` would raise.
+
+    :param string: the contents of an xml file, either as text or as raw bytes
+
+    :raises ParseError: the document is not well-formed xml, or refers to an undeclared entity
+
+    :returns: the root element of the xml tree
+    """
+    if lxml_etree is None:
+        return defused_fromstring(string)
+    try:
+        if isinstance(string, str):
+            # lxml rejects str input that carries an encoding declaration, so hand it over utf-8 encoded
+            parser = lxml_etree.XMLParser(encoding="utf-8", **LXML_PARSER_OPTIONS)
+            root = lxml_etree.fromstring(string.encode("utf-8"), parser)  # noqa: S320 (no entities or network)
+        else:
+            # Raw bytes are decoded by the parser itself, according to the xml declaration
+            parser = lxml_etree.XMLParser(**LXML_PARSER_OPTIONS)
+            root = lxml_etree.fromstring(string, parser)  # noqa: S320 (no entities or network)
+    except lxml_etree.XMLSyntaxError as exc:
+        # Callers should not need to know which backend is installed to catch broken files
+        raise ElementTree.ParseError(str(exc)) from exc
+    check_entities(root)
+    return root
+
+
+def check_entities(root: Any) -> None:
+    """Reject the entities that :mod:`lxml` leaves unresolved in a tree, failing as :mod:`defusedxml` would.
+
+    :param root: the root element of a tree parsed by :mod:`lxml`
+
+    :raises EntitiesForbidden: the document declares an entity
+    :raises ParseError: the document refers to an undeclared entity
+    """
+    docinfo = root.getroottree().docinfo
+    if not docinfo.doctype:
+        # Without a document type declaration, lxml itself rejects any entity other than the predefined ones
+        return
+    dtd = docinfo.internalDTD
+    entity = next(iter(dtd.iterentities()), None) if dtd is not None else None
+    if entity is not None:
+        raise EntitiesForbidden(entity.name, entity.content, None, entity.system_url, None, None)
+    reference = next(root.iter(lxml_etree.Entity), None)
+    if reference is not None:
+        raise ElementTree.ParseError(f"undefined entity {reference.text}")
 
 
 def block_to_dict(element: ElementTree.Element) -> Dict[str, Any]:
@@ -22,9 +94,7 @@ def block_to_dict(element: ElementTree.Element) -> Dict[str, Any]:
     :return: a (possibly nested) dict
     """
     result = {
-        k.lower(): sanitise(v)
-        for k, v in element.attrib.items()
-        if k not in ["type", "columns", "size"]
+        k.lower(): sanitise(v) for k, v in element.attrib.items() if k not in SKIPPED_ATTRIBUTES
     }
 
     # Manually adding n information if it is missing
@@ -47,7 +117,7 @@ def block_to_dict(element: ElementTree.Element) -> Dict[str, Any]:
     # If the element has children, extract the contents of each child
     for child in element:
         child_result = block_to_dict(child)
-        tag = child.tag.split(".")[0].replace("PP_", "").lower()
+        tag = normalise_tag(child.tag)
         if tag in result or tag == "chi":
             if tag not in result:
                 result[tag] = []
@@ -60,9 +130,9 @@ def block_to_dict(element: ElementTree.Element) -> Dict[str, Any]:
     return result
 
 
-def upfv2contents_to_dict(filecontents: str):
+def upfv2contents_to_dict(filecontents: Union[str, bytes]):
     """Convert a string (corresponding to the contents of a UPF v2 file) into a nested dictionary."""
-    root = defused_fromstring(filecontents)
+    root = parse_xml(filecontents)
     dct = block_to_dict(root)
     dct.pop("version")
     return dct
@@ -2,9 +2,10 @@
 
 from pathlib import Path
 
+import numpy as np
 import pytest
 
-from upf_tools.projectors import Projectors
+from upf_tools.projectors import Projector, Projectors
 
 projector_dir = Path(__file__).parent / "projectors"
 
@@ -15,3 +16,35 @@ def test_projector_creation(filename):
     projectors = Projectors.from_file(filename)
     assert len(projectors) > 0
     projectors.plot()
+
+
+@pytest.mark.parametrize("filename", sorted(projector_dir.glob("*.dat")))
+def test_projector_roundtrip(filename):
+    """Test that writing a :class:`Projectors` object to a string and reading it back preserves it."""
+    projectors = Projectors.from_file(filename)
+    reread = Projectors.from_str(projectors.to_str())
+    assert [p.l for p in reread] == [p.l for p in projectors]
+    for p, q in zip(projectors, reread):
+        assert np.allclose(p.x, q.x)
+        assert np.allclose(p.y, q.y)
+
+
+def test_projector_ragged_rows():
+    """Test that reading projectors whose rows have differing numbers of columns raises an error."""
+    with pytest.raises(ValueError):
+        Projectors.from_str("2 1\n0\n-1.0 0.37 0.1 0.2\n0.0 1.0\n")
+
+
+def test_projector_grid_not_modified():
+    """Test that clamping the logarithmic grid of a :class:`Projector` leaves the array passed to it untouched."""
+    x = np.array([-20.0, -1.0, 0.0])
+    projector = Projector(x, np.zeros(3))
+    assert np.all(projector.x == [-16.0, -1.0, 0.0])
+    assert np.all(x == [-20.0, -1.0, 0.0])
+
+
+def test_projector_r_follows_x():
+    """Test that the radial grid of a :class:`Projector` reflects in-place changes to its logarithmic grid."""
+    projector = Projector(np.array([-1.0, 0.0]), np.zeros(2))
+    projector.x[0] = 1.0
+    assert np.allclose(projector.r, np.exp([1.0, 0.0]))
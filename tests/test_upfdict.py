@@ -1,39 +1,42 @@
 """Testing the :class:`UPFDict` class."""
 
+import os
 from pathlib import Path
 
 import pytest
 
 from upf_tools import UPFDict
+from upf_tools.upfdict import _parse_upf
 
 sssp = Path(__file__).parent / "sssp"
 
-upffiles = [f for ext in ["upf", "UPF"] for f in sssp.glob(f"*.{ext}")]
+# A single, case-insensitive pass (globbing for *.upf and *.UPF separately would list each file twice on
+# case-insensitive filesystems), sorted so that every pytest-xdist worker collects the tests in the same order
+upffiles = sorted(
+    Path(entry.path)
+    for entry in os.scandir(sssp)
+    if entry.is_file() and entry.name.lower().endswith(".upf")
+)
 
 
-@pytest.mark.parametrize("filename", upffiles)
+@pytest.mark.parametrize("filename", upffiles, ids=lambda f: f.name)
 def test_from_upf(filename):
     """Test creating a :class:`UPFDict` object via the classmethod ``from_upf``."""
     psp = UPFDict.from_upf(filename)
-    assert "header" in psp
-    assert "z_valence" in psp["header"]
-    assert "number_of_proj" in psp["header"]
-    assert "number_of_wfc" in psp["header"]
-    assert "mesh" in psp
+    assert {"header", "mesh", "local", "rhoatom"} <= psp.keys()
+    assert {"z_valence", "number_of_proj", "number_of_wfc"} <= psp["header"].keys()
     assert "r" in psp["mesh"]
-    assert "local" in psp
-    assert "rhoatom" in psp
     assert psp.filename == filename
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def upf_instance(request):
-    """Create a :class:`UPFDict` object from a ``.upf`` file."""
+    """Create a :class:`UPFDict` object from a ``.upf`` file, shared by the (read-only) tests of each file."""
     instance = UPFDict.from_upf(request.param)
     return instance
 
 
-@pytest.mark.parametrize("upf_instance", upffiles, indirect=True, ids=[f.name for f in upffiles])
+@pytest.mark.parametrize("upf_instance", upffiles, indirect=True, ids=lambda f: f.name)
 class TestUPFDictMethods:
     """Test the methods of the :class:`UPFDict` class."""
 
@@ -48,3 +51,23 @@ class TestUPFDictMethods:
                 upf_instance.to_ld1_input()
             else:
                 upf_instance.to_oncvpsp_input()
+
+
+def test_from_upf_cache(tmp_path):
+    """Test that repeated calls to ``from_upf`` are cached, return independent objects and pick up file changes."""
+    _parse_upf.cache_clear()
+    filename = tmp_path / "psp.upf"
+    filename.write_text((sssp / "Si.pbe-n-rrkjus_psl.1.0.0.UPF").read_text())
+    psp = UPFDict.from_upf(filename)
+    assert psp["header"]["element"].strip() == "Si"
+    assert _parse_upf.cache_info()[:2] == (0, 1)
+
+    # Modifying the returned object must not affect subsequent calls, which are served from the cache
+    psp["header"]["element"] = "Xx"
+    assert UPFDict.from_upf(filename)["header"]["element"].strip() == "Si"
+    assert _parse_upf.cache_info()[:2] == (1, 1)
+
+    # Overwriting the file must invalidate the cache
+    filename.write_text((sssp / "Al.pbe-n-kjpaw_psl.1.0.0.UPF").read_text())
+    assert UPFDict.from_upf(filename)["header"]["element"].strip() == "Al"
+    assert _parse_upf.cache_info()[:2] == (1, 2)
@@ -0,0 +1,52 @@
+"""Testing the utilities in :mod:`upf_tools.utils`."""
+
+import pytest
+
+from upf_tools.utils import normalise_tag, sanitise
+
+
+@pytest.mark.parametrize(
+    "string, expected",
+    [
+        ("1", 1),
+        ("  2308", 2308),
+        ("-0", 0),
+        ("2.300000000000e0", 2.3),
+        ("   -0.4925597981E+01", -4.925597981),
+        ("1e5", 1e5),
+        ("true", True),
+        ("false", False),
+        ("1.", "1."),
+        ("01", "01"),
+        ("1.d0", "1.d0"),
+        ("T", "T"),
+        ("Si", "Si"),
+        ("  PBE", "  PBE"),
+        ('"Si"', "Si"),
+        ("null", None),
+        ("Infinity", float("inf")),
+        ("[1, 2]", [1, 2]),
+        ("", ""),
+    ],
+)
+def test_sanitise(string, expected):
+    """Test that :func:`sanitise` converts strings exactly as ``json.loads`` would."""
+    result = sanitise(string)
+    assert result == expected
+    assert type(result) is type(expected)
+
+
+def test_sanitise_returns_independent_containers():
+    """Test that modifying a list returned by :func:`sanitise` does not affect later calls."""
+    result = sanitise("[1, 2]")
+    result.append(3)
+    assert sanitise("[1, 2]") == [1, 2]
+
+
+@pytest.mark.parametrize(
+    "tag, expected",
+    [("PP_HEADER", "header"), ("PP_CHI.1", "chi"), ("PP_BETA.12", "beta"), ("UPF", "upf")],
+)
+def test_normalise_tag(tag, expected):
+    """Test that :func:`normalise_tag` strips the PP_ prefix and any numeric suffix."""
+    assert normalise_tag(tag) == expected
@@ -0,0 +1,19 @@
+"""Testing the UPF v1 reader in :mod:`upf_tools.v1`."""
+
+import numpy as np
+import pytest
+
+from upf_tools.v1 import upfv1contents_to_dict
+
+
+def test_numeric_block():
+    """Test that a numeric block is read into a flat array."""
+    dct = upfv1contents_to_dict("<PP_R>\n  0.0 1.0 2.0\n  3.0\n</PP_R>")
+    assert np.array_equal(dct["r"], [0.0, 1.0, 2.0, 3.0])
+
+
+@pytest.mark.parametrize("value", ["1.0D+00", "*****"])
+def test_numeric_block_invalid(value):
+    """Test that an invalid number in a numeric block raises an error rather than truncating the array."""
+    with pytest.raises(ValueError):
+        upfv1contents_to_dict(f"<PP_R>\n  0.0 {value} 2.0\n</PP_R>")
@@ -0,0 +1,57 @@
+"""Testing the UPF v2 reader in :mod:`upf_tools.v2`."""
+
+import pytest
+from defusedxml import EntitiesForbidden
+
+from upf_tools import v2
+
+
+@pytest.fixture(params=["lxml", "defusedxml"])
+def backend(request, monkeypatch):
+    """Run a test with each of the xml parsers that :func:`upf_tools.v2.parse_xml` can use."""
+    if request.param == "lxml":
+        pytest.importorskip("lxml")
+    else:
+        monkeypatch.setattr(v2, "lxml_etree", None)
+    return request.param
+
+
+def test_parse_xml(backend):
+    """Test that a document with a (harmless) document type declaration is parsed."""
+    xml = '<?xml version="1.0"?>\n<!DOCTYPE UPF [<!ELEMENT UPF ANY>]>\n<UPF version="2.0.1"><PP_INFO>Si</PP_INFO></UPF>'
+    assert v2.upfv2contents_to_dict(xml) == {"info": "Si"}
+
+
+@pytest.mark.parametrize(
+    "declaration",
+    ['<!ENTITY el "Si">', '<!ENTITY el SYSTEM "file:///etc/hostname">'],
+)
+def test_parse_xml_entity_declaration(backend, declaration):
+    """Test that both backends refuse documents that declare entities."""
+    xml = f'<?xml version="1.0"?>\n<!DOCTYPE UPF [{declaration}]>\n<UPF version="2.0.1"><PP_INFO>&el;</PP_INFO></UPF>'
+    with pytest.raises(EntitiesForbidden):
+        v2.parse_xml(xml)
+
+
+def test_parse_xml_undefined_entity(backend):
+    """Test that both backends refuse references to entities that are not declared."""
+    xml = '<?xml version="1.0"?>\n<!DOCTYPE UPF SYSTEM "upf.dtd">\n<UPF version="2.0.1"><PP_INFO>&el;</PP_INFO></UPF>'
+    with pytest.raises(v2.ElementTree.ParseError):
+        v2.parse_xml(xml.encode())
+
+
+@pytest.mark.parametrize(
+    "xml",
+    [
+        '<?xml version="1.0"?>\n<UPF version="2.0.1"><PP_INFO>a & b</PP_INFO></UPF>',
+        '<?xml version="1.0"?>\n<UPF version="2.0.1"><PP_INFO>Si</PP_INFO>',
+        '<?xml version="1.0"?>\n<UPF version="2.0.1"><PP_INFO>&el;</PP_INFO></UPF>',
+    ],
+    ids=["malformed", "truncated", "undefined-entity-without-doctype"],
+)
+def test_parse_xml_syntax_error(backend, xml):
+    """Test that both backends raise the same exception for documents that are not well-formed."""
+    with pytest.raises(v2.ElementTree.ParseError):
+        v2.parse_xml(xml)
+    with pytest.raises(v2.ElementTree.ParseError):
+        v2.parse_xml(xml.encode())